@@ -4,7 +4,7 @@ Script único e principal para catalogar novos PDFs e indexá-los para a IA.
 Este é o script a ser executado para atualizar a base de conhecimento do Oráculo.
 """
 import config
-from src.database_manager import DatabaseManager
+from src.database_manager import DatabaseManager, descomprimir_texto
 from src.ia_processor import dividir_texto_em_chunks, gerar_embeddings_para_chunks, adicionar_chunks_ao_chroma
 from src.pdf_processor import encontrar_pdfs, calcular_hash_arquivo, extrair_texto_pdf
 
@@ -26,9 +26,8 @@ def catalogar_novos_documentos(db_manager: DatabaseManager):
         if not hash_do_arquivo: continue
 
         texto_completo = extrair_texto_pdf(pdf_path)
-        texto_preview = texto_completo[:config.TAMANHO_MAX_PREVIEW] + "..." if texto_completo else ""
 
-        if db_manager.inserir_documento(pdf_path.name, str(pdf_path.resolve()), texto_preview, texto_completo, hash_do_arquivo):
+        if db_manager.inserir_documento(pdf_path.name, str(pdf_path.resolve()), texto_completo, hash_do_arquivo):
             print(f"  - SUCESSO: Documento '{pdf_path.name}' catalogado.")
             novos_documentos_adicionados += 1
         else:
@@ -47,8 +46,9 @@ def indexar_novos_documentos(db_manager: DatabaseManager):
 
     print(f"-> Encontrados {len(documentos_para_indexar)} novos documentos para indexar.")
     
-    for doc_id, nome_arquivo, texto_completo in documentos_para_indexar:
+    for doc_id, nome_arquivo, texto_comprimido in documentos_para_indexar:
         print(f"\nIndexando Documento ID: {doc_id}, Nome: {nome_arquivo}")
+        texto_completo = descomprimir_texto(texto_comprimido)
         if not texto_completo or not texto_completo.strip():
             print("  - AVISO: Documento sem texto. Pulando.")
             continue
@@ -58,9 +58,13 @@ def indexar_novos_documentos(db_manager: DatabaseManager):
             print("  - AVISO: Não foram gerados chunks. Pulando.")
             continue
         
-        embeddings = gerar_embeddings_para_chunks(chunks)
-        if embeddings:
-            adicionar_chunks_ao_chroma(doc_id, nome_arquivo, chunks, embeddings)
+        embeddings = gerar_embeddings_para_chunks([chunk for chunk, _, _ in chunks])
+        if not embeddings:
+            continue
+
+        intervalos = [(inicio, fim) for _, inicio, fim in chunks]
+        ids_chunks = db_manager.salvar_chunks(doc_id, texto_completo, intervalos)
+        if ids_chunks and adicionar_chunks_ao_chroma(doc_id, nome_arquivo, ids_chunks, embeddings):
             db_manager.marcar_documento_como_indexado(doc_id)
             
     print("--- Fim da Etapa 2: Indexação para a IA concluída. ---")
@@ -72,6 +76,8 @@ def main():
     try:
         db_manager = DatabaseManager()
         db_manager.criar_tabela_documentos()
+        db_manager.criar_tabelas_de_chunks()
+        db_manager.comprimir_textos_existentes()
         catalogar_novos_documentos(db_manager)
         indexar_novos_documentos(db_manager)
         print("\nRotina de atualização do Oráculo finalizada com sucesso!")
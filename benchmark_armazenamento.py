@@ -0,0 +1,222 @@
+# benchmark_armazenamento.py
+"""
+Mede o espaço em disco (arquivo SQLite + diretório do ChromaDB) antes e depois da
+migração para texto comprimido e chunks guardados como intervalos.
+
+"Antes" reproduz o formato anterior: 'texto_preview' e 'texto_completo' em texto puro
+no SQLite e uma cópia em minúsculas de cada chunk em 'documents' no ChromaDB.
+"Depois" aplica 'comprimir_textos_existentes' sobre uma cópia desse mesmo banco,
+registra os chunks com 'salvar_chunks' e grava no ChromaDB só embeddings e metadados.
+Os embeddings são vetores aleatórios com a dimensão do modelo, idênticos nos dois
+cenários, para não depender do modelo de embedding.
+
+Por padrão usa um acervo sintético com vocabulário variado. Com '--do-banco', usa
+os textos já catalogados no banco configurado. Ao final confere que o índice de
+palavras-chave ainda encontra datas e nomes compostos (hífen e apóstrofo).
+
+Exemplo:
+    python benchmark_armazenamento.py --megabytes 5
+"""
+import argparse
+import chromadb
+import config
+import random
+import re
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+from src.database_manager import DatabaseManager, descomprimir_texto, montar_consulta_fts
+from src.divisor_texto import dividir_texto
+
+DIMENSAO_EMBEDDING = 384  # paraphrase-multilingual-MiniLM-L12-v2
+SILABAS = ["ba", "ca", "da", "fe", "ga", "li", "ma", "no", "pa", "ri", "sa", "to", "vi",
+           "ção", "ões", "al", "ar", "en", "es", "in", "or", "os", "ur", "lh", "nh", "qu"]
+NOMES_COMPOSTOS = ["Silva-Oliveira", "Souza-Lima", "D'Ávila", "Sant'Anna", "Pereira-Costa"]
+PADROES_DE_BUSCA = {
+    "data": r"\b\d{2}/\d{2}/\d{4}\b",
+    "nome com hífen": r"\b\w+-\w+\b",
+    "nome com apóstrofo": r"\b\w+'\w+\b",
+}
+
+def gerar_acervo_sintetico(total_caracteres: int, semente: int = 7) -> list[str]:
+    """Gera documentos com vocabulário amplo (distribuição de Zipf), parágrafos e quebras de linha."""
+    gerador = random.Random(semente)
+    vocabulario = ["".join(gerador.choices(SILABAS, k=gerador.randint(1, 5))) for _ in range(30000)]
+    pesos = [1 / (posicao + 1) for posicao in range(len(vocabulario))]
+    documentos = []
+    gerados = 0
+    while gerados < total_caracteres:
+        tamanho_documento = gerador.randint(5000, 120000)
+        palavras = gerador.choices(vocabulario, weights=pesos, k=tamanho_documento // 6)
+        partes = []
+        for indice, palavra in enumerate(palavras):
+            partes.append(palavra)
+            sorteio = gerador.random()
+            partes.append(".\n\n" if sorteio < 0.01 else ". " if sorteio < 0.07 else "\n" if sorteio < 0.15 else " ")
+            if indice % 400 == 0:
+                partes.append(f"{gerador.randint(1, 31):02d}/{gerador.randint(1, 12):02d}/{gerador.randint(1900, 2024)} ")
+                partes.append(f"{gerador.choice(NOMES_COMPOSTOS)} ")
+        documento = "".join(partes).capitalize()
+        documentos.append(documento)
+        gerados += len(documento)
+    return documentos
+
+def carregar_textos_do_banco() -> list[str]:
+    conn = sqlite3.connect(config.DB_NOME_ARQUIVO)
+    try:
+        linhas = conn.execute("SELECT texto_completo FROM documentos WHERE texto_completo IS NOT NULL").fetchall()
+    finally:
+        conn.close()
+    return [texto for texto in (descomprimir_texto(linha[0]) for linha in linhas) if texto]
+
+def tamanho_em_disco(caminho: Path) -> int:
+    if caminho.is_file():
+        return caminho.stat().st_size
+    return sum(arquivo.stat().st_size for arquivo in caminho.rglob("*") if arquivo.is_file())
+
+def embeddings_aleatorios(quantidade: int, gerador: random.Random) -> list[list[float]]:
+    return [[gerador.uniform(-1, 1) for _ in range(DIMENSAO_EMBEDDING)] for _ in range(quantidade)]
+
+def gravar_chroma(caminho: Path, lotes: list[dict]):
+    cliente = chromadb.PersistentClient(path=str(caminho))
+    colecao = cliente.get_or_create_collection(name=config.CHROMA_COLLECTION_NAME, metadata={"hnsw:space": "cosine"})
+    for lote in lotes:
+        colecao.add(**lote)
+
+def montar_cenario_anterior(pasta: Path, textos: list[str], chunks_por_documento: list[list], semente: int):
+    """Cria o banco e a coleção no formato anterior à compressão."""
+    conn = sqlite3.connect(pasta / "antes.db")
+    conn.execute("""
+    CREATE TABLE documentos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome_arquivo TEXT NOT NULL,
+        caminho_arquivo TEXT NOT NULL UNIQUE,
+        texto_preview TEXT,
+        texto_completo TEXT,
+        data_catalogacao TIMESTAMP,
+        hash_arquivo TEXT UNIQUE,
+        indexado_no_chroma BOOLEAN DEFAULT 0
+    )
+    """)
+    for doc_id, texto in enumerate(textos, start=1):
+        conn.execute(
+            "INSERT INTO documentos (id, nome_arquivo, caminho_arquivo, texto_preview, texto_completo, data_catalogacao, hash_arquivo, indexado_no_chroma) VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, ?, 1)",
+            (doc_id, f"doc{doc_id}.pdf", f"/acervo/doc{doc_id}.pdf", texto[:500] + "...", texto, f"hash{doc_id}")
+        )
+    conn.commit()
+    conn.close()
+
+    gerador = random.Random(semente)
+    lotes = []
+    for doc_id, chunks in enumerate(chunks_por_documento, start=1):
+        lotes.append({
+            "ids": [f"doc{doc_id}_chunk{i}" for i in range(len(chunks))],
+            "embeddings": embeddings_aleatorios(len(chunks), gerador),
+            "metadatas": [{"doc_id_original": doc_id, "nome_arquivo_original": f"doc{doc_id}.pdf", "indice_chunk": i} for i in range(len(chunks))],
+            "documents": [chunk.lower() for chunk, _, _ in chunks],
+        })
+    gravar_chroma(pasta / "chroma_antes", lotes)
+
+def montar_cenario_novo(pasta: Path, textos: list[str], chunks_por_documento: list[list], semente: int):
+    """Migra uma cópia do banco anterior e grava a coleção sem cópias de texto."""
+    shutil.copy(pasta / "antes.db", pasta / "depois.db")
+    config.DB_NOME_ARQUIVO = str(pasta / "depois.db")
+    db_manager = DatabaseManager()
+    try:
+        db_manager.criar_tabela_documentos()
+        db_manager.criar_tabelas_de_chunks()
+        db_manager.comprimir_textos_existentes()
+
+        gerador = random.Random(semente)
+        lotes = []
+        for doc_id, (texto, chunks) in enumerate(zip(textos, chunks_por_documento), start=1):
+            ids_sqlite = db_manager.salvar_chunks(doc_id, texto, [(inicio, fim) for _, inicio, fim in chunks])
+            db_manager.marcar_documento_como_indexado(doc_id)
+            lotes.append({
+                "ids": [f"doc{doc_id}_chunk{i}" for i in range(len(chunks))],
+                "embeddings": embeddings_aleatorios(len(chunks), gerador),
+                "metadatas": [{"doc_id_original": doc_id, "nome_arquivo_original": f"doc{doc_id}.pdf", "indice_chunk": i, "id_chunk_sqlite": id_sqlite}
+                              for i, id_sqlite in enumerate(ids_sqlite)],
+            })
+        db_manager.conn.execute("VACUUM")
+    finally:
+        db_manager.close()
+    gravar_chroma(pasta / "chroma_depois", lotes)
+
+def verificar_busca_por_palavras(caminho_banco: Path, textos: list[str]) -> bool:
+    """
+    Executa no banco migrado a mesma consulta FTS5 da busca do Oráculo para uma data e
+    nomes compostos presentes no acervo. Retorna False se algum termo não tiver candidatos.
+    """
+    termos = {}
+    for rotulo, padrao in PADROES_DE_BUSCA.items():
+        encontrado = next((m.group(0) for texto in textos for m in [re.search(padrao, texto)] if m), None)
+        if encontrado:
+            termos[rotulo] = encontrado.lower()
+
+    conn = sqlite3.connect(caminho_banco)
+    sucesso = True
+    try:
+        print("\nBusca por palavras-chave no banco migrado:")
+        consultas = [(rotulo, [termo]) for rotulo, termo in termos.items()]
+        consultas.append(("todas juntas (OR)", list(termos.values())))
+        for rotulo, palavras in consultas:
+            try:
+                quantidade = len(conn.execute(
+                    "SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH ? ORDER BY bm25(chunks_fts) LIMIT ?",
+                    (montar_consulta_fts(palavras), config.LIMITE_CANDIDATOS_PALAVRAS_CHAVE)
+                ).fetchall())
+            except sqlite3.Error as e:
+                quantidade, rotulo = 0, f"{rotulo} (erro: {e})"
+            print(f"  {rotulo:<24} {', '.join(palavras):<40} {quantidade:5d} candidato(s)")
+            sucesso = sucesso and quantidade > 0
+        for rotulo in PADROES_DE_BUSCA.keys() - termos.keys():
+            print(f"  {rotulo:<24} nenhum exemplo no acervo; não verificado.")
+    finally:
+        conn.close()
+    return sucesso
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de espaço em disco do armazenamento de textos.")
+    parser.add_argument("--megabytes", type=float, default=2.6, help="Tamanho do acervo sintético, em milhões de caracteres.")
+    parser.add_argument("--do-banco", action="store_true", help="Usa os textos catalogados no banco SQLite configurado.")
+    parser.add_argument("--semente", type=int, default=7)
+    args = parser.parse_args()
+
+    textos = carregar_textos_do_banco() if args.do_banco else gerar_acervo_sintetico(int(args.megabytes * 1e6), args.semente)
+    chunks_por_documento = [dividir_texto(texto) for texto in textos]
+    total_caracteres = sum(len(texto) for texto in textos)
+    total_bytes = sum(len(texto.encode("utf-8")) for texto in textos)
+    print(f"Acervo: {len(textos)} documento(s), {total_caracteres / 1e6:.2f} milhões de caracteres "
+          f"({total_bytes / 1e6:.2f} MB em UTF-8), {sum(map(len, chunks_por_documento))} chunks.")
+
+    with tempfile.TemporaryDirectory() as pasta_temporaria:
+        pasta = Path(pasta_temporaria)
+        montar_cenario_anterior(pasta, textos, chunks_por_documento, args.semente)
+        montar_cenario_novo(pasta, textos, chunks_por_documento, args.semente)
+
+        conn = sqlite3.connect(pasta / "depois.db")
+        try:
+            bytes_texto = conn.execute("SELECT COALESCE(SUM(length(texto_completo)), 0) FROM documentos").fetchone()[0]
+        finally:
+            conn.close()
+
+        medidas = [
+            ("SQLite", tamanho_em_disco(pasta / "antes.db"), tamanho_em_disco(pasta / "depois.db")),
+            ("ChromaDB", tamanho_em_disco(pasta / "chroma_antes"), tamanho_em_disco(pasta / "chroma_depois")),
+        ]
+        medidas.append(("Total", sum(m[1] for m in medidas), sum(m[2] for m in medidas)))
+
+        print(f"\n{'':<10} {'antes (MB)':>12} {'depois (MB)':>12} {'redução':>9}")
+        for rotulo, antes, depois in medidas:
+            print(f"{rotulo:<10} {antes / 1e6:12.2f} {depois / 1e6:12.2f} {antes / depois if depois else 0:8.2f}x")
+        print(f"\nTexto comprimido no SQLite: {bytes_texto / 1e6:.2f} MB "
+              f"(taxa de compressão {total_bytes / bytes_texto if bytes_texto else 0:.2f}x).")
+
+        if not verificar_busca_por_palavras(pasta / "depois.db", textos):
+            raise SystemExit("ERRO: o índice de palavras-chave não encontrou algum dos termos verificados.")
+
+
+if __name__ == "__main__":
+    main()
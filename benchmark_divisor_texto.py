@@ -0,0 +1,117 @@
+# benchmark_divisor_texto.py
+"""
+Compara o divisor de texto embutido ('src/divisor_texto.py') com o
+RecursiveCharacterTextSplitter do langchain usado anteriormente, em documentos grandes.
+
+Por padrão gera textos sintéticos no formato extraído de PDFs (linhas curtas,
+parágrafos e frases). Com '--do-banco', usa os textos já catalogados no SQLite.
+
+Exemplo:
+    python benchmark_divisor_texto.py --tamanhos-mb 1 10 50 --repeticoes 3
+"""
+import argparse
+import config
+import random
+import sqlite3
+import time
+from src.database_manager import descomprimir_texto
+from src.divisor_texto import dividir_texto
+
+PALAVRAS = [
+    "certidão", "nascimento", "casamento", "cartório", "registro", "livro", "folha",
+    "termo", "escritura", "imóvel", "matrícula", "proprietário", "outorgante", "de",
+    "do", "da", "que", "em", "para", "com", "João", "Maria", "Antônio", "Silva",
+    "Oliveira", "São", "Paulo", "R$", "1.250,00", "15/03/1952", "nº", "123",
+]
+
+def gerar_texto_sintetico(tamanho_caracteres: int, semente: int = 42) -> str:
+    """Gera texto parecido com o extraído de PDFs: linhas quebradas, frases e parágrafos."""
+    gerador = random.Random(semente)
+    partes = []
+    tamanho_atual = 0
+    while tamanho_atual < tamanho_caracteres:
+        frase = " ".join(gerador.choices(PALAVRAS, k=gerador.randint(6, 25))).capitalize() + ". "
+        if gerador.random() < 0.3:
+            frase = frase.replace(" ", "\n", 1)
+        if gerador.random() < 0.1:
+            frase += "\n\n"
+        partes.append(frase)
+        tamanho_atual += len(frase)
+    return "".join(partes)[:tamanho_caracteres]
+
+def carregar_textos_do_banco() -> list[str]:
+    conn = sqlite3.connect(config.DB_NOME_ARQUIVO)
+    try:
+        linhas = conn.execute("SELECT texto_completo FROM documentos WHERE texto_completo IS NOT NULL").fetchall()
+    finally:
+        conn.close()
+    return [descomprimir_texto(linha[0]) for linha in linhas]
+
+def divisor_langchain():
+    """Reproduz o 'dividir_texto_em_chunks' anterior, que criava um splitter a cada chamada."""
+    try:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+    except ImportError:
+        try:
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+        except ImportError:
+            return None
+
+    def dividir(texto: str) -> list[str]:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=config.TAMANHO_CHUNK,
+            chunk_overlap=config.SOBREPOSICAO_CHUNK,
+            length_function=len
+        )
+        return text_splitter.split_text(texto)
+    return dividir
+
+def medir(funcao, textos: list[str], repeticoes: int) -> tuple[float, list]:
+    """Retorna o melhor tempo entre as repetições e o resultado da última execução."""
+    melhor = float("inf")
+    resultado = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = [funcao(texto) for texto in textos]
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+def resumir(rotulo: str, segundos: float, total_caracteres: int, chunks: list[str]):
+    tamanhos = [len(chunk) for chunk in chunks] or [0]
+    print(f"  {rotulo:<12} {segundos * 1000:10.1f} ms  {total_caracteres / 1e6 / segundos if segundos else 0:8.1f} MB/s  "
+          f"{len(chunks):7d} chunks  médio={sum(tamanhos) / len(tamanhos):6.0f}  máx={max(tamanhos):5d}")
+
+def comparar(rotulo: str, textos: list[str], repeticoes: int):
+    total_caracteres = sum(len(texto) for texto in textos)
+    print(f"\n{rotulo}: {len(textos)} texto(s), {total_caracteres / 1e6:.2f} milhões de caracteres")
+
+    segundos, resultado = medir(dividir_texto, textos, repeticoes)
+    for texto, chunks in zip(textos, resultado):
+        assert all(texto[inicio:fim] == chunk for chunk, inicio, fim in chunks), "Intervalo inconsistente."
+    resumir("embutido", segundos, total_caracteres, [chunk for chunks in resultado for chunk, _, _ in chunks])
+
+    dividir_langchain = divisor_langchain()
+    if dividir_langchain is None:
+        print("  langchain    não instalado; comparação ignorada.")
+        return
+    segundos_langchain, resultado_langchain = medir(dividir_langchain, textos, repeticoes)
+    resumir("langchain", segundos_langchain, total_caracteres, [chunk for chunks in resultado_langchain for chunk in chunks])
+    print(f"  Aceleração: {segundos_langchain / segundos:.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do divisor de texto em chunks.")
+    parser.add_argument("--tamanhos-mb", type=float, nargs="+", default=[1, 5, 20],
+                        help="Tamanhos dos documentos sintéticos, em milhões de caracteres.")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Repetições por medição (vale o melhor tempo).")
+    parser.add_argument("--do-banco", action="store_true", help="Usa os textos catalogados no banco SQLite.")
+    args = parser.parse_args()
+
+    print(f"TAMANHO_CHUNK={config.TAMANHO_CHUNK} SOBREPOSICAO_CHUNK={config.SOBREPOSICAO_CHUNK}")
+    if args.do_banco:
+        comparar("Documentos do banco", carregar_textos_do_banco(), args.repeticoes)
+    for tamanho_mb in args.tamanhos_mb:
+        comparar(f"Documento sintético de {tamanho_mb:g}M", [gerar_texto_sintetico(int(tamanho_mb * 1e6))], args.repeticoes)
+
+
+if __name__ == "__main__":
+    main()
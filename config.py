@@ -14,12 +14,15 @@ OLLAMA_API_URL = "http://localhost:11434/api/generate"
 DB_NOME_ARQUIVO = "oraculo_familiar.db"
 CHROMA_DATA_PATH = "chroma_db_store"
 CHROMA_COLLECTION_NAME = "documentos_familiares"
+NIVEL_COMPRESSAO_TEXTO = 6  # Nível do zlib (1 = mais rápido, 9 = menor arquivo)
 
 # --- Configurações de Processamento ---
 PASTA_DOCUMENTOS = "documentos_para_catalogar"
 TAMANHO_CHUNK = 1000
 SOBREPOSICAO_CHUNK = 150
 TOP_N_CHUNKS = 5
+LIMITE_CACHE_TEXTOS_BYTES = 4 * 1024 * 1024  # Memória máxima para textos descomprimidos em cache na busca
+LIMITE_CANDIDATOS_PALAVRAS_CHAVE = 200  # Máximo de chunks do índice de palavras-chave repassados ao ChromaDB
 LIMIAR_MINIMO_TEXTO_OCR = 100
 
 # --- Configurações de Conversa ---
@@ -2,12 +2,44 @@
 """
 Módulo contendo a classe DatabaseManager para encapsular todas as interações
 com o banco de dados SQLite.
+
+O texto completo de cada documento é armazenado uma única vez, comprimido com
+zlib. Os chunks não guardam cópias do texto: são registrados apenas como
+intervalos (inicio, fim) sobre o texto canônico, e a busca por palavras-chave
+é feita por um índice FTS5 sem conteúdo (apenas o índice invertido é salvo).
 """
 import config
 import datetime
 import sqlite3
+import zlib
 from pathlib import Path
 
+def comprimir_texto(texto: str) -> bytes | None:
+    """Comprime o texto de um documento para armazenamento no banco. Textos vazios viram NULL."""
+    if not texto:
+        return None
+    return zlib.compress(texto.encode("utf-8"), config.NIVEL_COMPRESSAO_TEXTO)
+
+def descomprimir_texto(dado) -> str:
+    """
+    Descomprime um texto lido do banco. Aceita também valores em texto puro,
+    gravados antes da adoção da compressão.
+    """
+    if dado is None:
+        return ""
+    if isinstance(dado, str):
+        return dado
+    return zlib.decompress(dado).decode("utf-8")
+
+def montar_consulta_fts(palavras_chave: list[str]) -> str:
+    """
+    Monta a expressão MATCH do FTS5: cada palavra vira um prefixo entre aspas, unidos
+    por OR. Palavras com '/', '-', apóstrofo etc. viram frases de vários tokens
+    (ex.: datas, nomes compostos), o que exige o índice com detail=full.
+    """
+    termos = [f'"{palavra.replace(chr(34), "")}"*' for palavra in palavras_chave if palavra.replace('"', "")]
+    return " OR ".join(termos)
+
 class DatabaseManager:
     """Gerencia a conexão e as operações com o banco de dados SQLite."""
 
@@ -31,8 +63,7 @@ class DatabaseManager:
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nome_arquivo TEXT NOT NULL,
             caminho_arquivo TEXT NOT NULL UNIQUE,
-            texto_preview TEXT,
-            texto_completo TEXT,
+            texto_completo BLOB,
             data_catalogacao TIMESTAMP,
             hash_arquivo TEXT UNIQUE,
             indexado_no_chroma BOOLEAN DEFAULT 0
@@ -41,9 +72,62 @@ class DatabaseManager:
         self.conn.commit()
         print("Tabela 'documentos' verificada/criada com sucesso.")
 
+    def criar_tabelas_de_chunks(self):
+        """Cria a tabela de intervalos dos chunks e o índice de palavras-chave."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS chunks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            doc_id INTEGER NOT NULL REFERENCES documentos(id),
+            indice_chunk INTEGER NOT NULL,
+            inicio INTEGER NOT NULL,
+            fim INTEGER NOT NULL,
+            UNIQUE (doc_id, indice_chunk)
+        )
+        """)
+        # Tabela FTS5 sem conteúdo: o tokenizador já normaliza maiúsculas/minúsculas,
+        # então não é preciso guardar uma cópia do texto em minúsculas. O detail=full
+        # (padrão) guarda posições, necessárias para buscar datas e nomes compostos.
+        cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts
+        USING fts5(texto, content='', tokenize='unicode61')
+        """)
+        self.conn.commit()
+        print("Tabelas 'chunks' e 'chunks_fts' verificadas/criadas com sucesso.")
+
+    def comprimir_textos_existentes(self):
+        """
+        Migra bancos antigos: comprime textos gravados sem compressão, descarta o
+        'texto_preview' e marca para reindexação os documentos indexados antes da
+        tabela de chunks existir.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT id, texto_completo FROM documentos WHERE typeof(texto_completo) = 'text'")
+        pendentes = cursor.fetchall()
+        for doc_id, texto_completo in pendentes:
+            cursor.execute("UPDATE documentos SET texto_completo = ? WHERE id = ?",
+                           (comprimir_texto(texto_completo), doc_id))
+
+        colunas = [coluna[1] for coluna in cursor.execute("PRAGMA table_info(documentos)")]
+        if "texto_preview" in colunas:
+            cursor.execute("UPDATE documentos SET texto_preview = NULL WHERE texto_preview IS NOT NULL")
+
+        cursor.execute("""
+        UPDATE documentos SET indexado_no_chroma = 0
+        WHERE indexado_no_chroma = 1 AND id NOT IN (SELECT DISTINCT doc_id FROM chunks)
+        """)
+        reindexar = cursor.rowcount
+        self.conn.commit()
+
+        if pendentes:
+            # Devolve ao sistema de arquivos as páginas liberadas pela compressão.
+            self.conn.execute("VACUUM")
+            print(f"-> {len(pendentes)} texto(s) comprimido(s) no banco de dados.")
+        if reindexar > 0:
+            print(f"-> {reindexar} documento(s) marcado(s) para reindexação.")
+
     def inserir_documento(self, nome_arquivo: str, caminho_arquivo: str,
-                          texto_preview: str, texto_completo: str,
-                          hash_arquivo: str) -> bool:
+                          texto_completo: str, hash_arquivo: str) -> bool:
         """
         Insere um novo documento no banco. Retorna True se inseriu, False caso contrário.
         """
@@ -51,8 +135,8 @@ class DatabaseManager:
             cursor = self.conn.cursor()
             data_atual = datetime.datetime.now()
             cursor.execute(
-                "INSERT INTO documentos (nome_arquivo, caminho_arquivo, texto_preview, texto_completo, data_catalogacao, hash_arquivo, indexado_no_chroma) VALUES (?, ?, ?, ?, ?, ?, 0)",
-                (nome_arquivo, caminho_arquivo, texto_preview, texto_completo, data_atual, hash_arquivo)
+                "INSERT INTO documentos (nome_arquivo, caminho_arquivo, texto_completo, data_catalogacao, hash_arquivo, indexado_no_chroma) VALUES (?, ?, ?, ?, ?, 0)",
+                (nome_arquivo, caminho_arquivo, comprimir_texto(texto_completo), data_atual, hash_arquivo)
             )
             self.conn.commit()
             return True
@@ -63,6 +147,36 @@ class DatabaseManager:
             print(f"  - ERRO ao inserir documento '{nome_arquivo}': {e}")
             return False
 
+    def salvar_chunks(self, doc_id: int, texto_completo: str, intervalos: list[tuple[int, int]]) -> list[int]:
+        """
+        Registra os intervalos (inicio, fim) dos chunks de um documento e indexa
+        seu texto no FTS5. Chunks anteriores do mesmo documento são substituídos.
+        Retorna os ids dos chunks na mesma ordem dos intervalos.
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT id, inicio, fim FROM chunks WHERE doc_id = ?", (doc_id,))
+            for chunk_id, inicio, fim in cursor.fetchall():
+                # Em tabelas sem conteúdo, a remoção exige o texto original indexado.
+                cursor.execute("INSERT INTO chunks_fts (chunks_fts, rowid, texto) VALUES ('delete', ?, ?)",
+                               (chunk_id, texto_completo[inicio:fim]))
+            cursor.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+
+            ids_chunks = []
+            for indice, (inicio, fim) in enumerate(intervalos):
+                cursor.execute("INSERT INTO chunks (doc_id, indice_chunk, inicio, fim) VALUES (?, ?, ?, ?)",
+                               (doc_id, indice, inicio, fim))
+                chunk_id = cursor.lastrowid
+                cursor.execute("INSERT INTO chunks_fts (rowid, texto) VALUES (?, ?)",
+                               (chunk_id, texto_completo[inicio:fim]))
+                ids_chunks.append(chunk_id)
+            self.conn.commit()
+            return ids_chunks
+        except Exception as e:
+            self.conn.rollback()
+            print(f"  - ERRO ao salvar chunks do documento ID {doc_id}: {e}")
+            return []
+
     def marcar_documento_como_indexado(self, doc_id: int):
         """Atualiza o status de um documento para indexado."""
         try:
@@ -74,12 +188,15 @@ class DatabaseManager:
             print(f"  - ERRO ao marcar documento ID {doc_id} como indexado: {e}")
 
     def obter_documentos_para_embedding(self) -> list:
-        """Busca todos os documentos que ainda não foram indexados no ChromaDB."""
+        """
+        Busca todos os documentos que ainda não foram indexados no ChromaDB.
+        O texto é retornado comprimido; use 'descomprimir_texto' ao processá-lo.
+        """
         try:
             cursor = self.conn.cursor()
-            cursor.execute("SELECT id, nome_arquivo, texto_completo FROM documentos WHERE texto_completo IS NOT NULL AND texto_completo != '' AND indexado_no_chroma = 0")
+            cursor.execute("SELECT id, nome_arquivo, texto_completo FROM documentos WHERE texto_completo IS NOT NULL AND length(texto_completo) > 0 AND indexado_no_chroma = 0")
             documentos = cursor.fetchall()
             return documentos
         except Exception as e:
             print(f"  - ERRO ao obter documentos para embedding: {e}")
-            return []
\ No newline at end of file
+            return []
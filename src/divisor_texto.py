@@ -0,0 +1,87 @@
+# src/divisor_texto.py
+"""
+Módulo com o divisor de texto em chunks usado na indexação.
+
+Divide o texto preferencialmente em quebras de parágrafo, depois em fins de
+frase, quebras de linha e espaços entre palavras, respeitando TAMANHO_CHUNK e
+SOBREPOSICAO_CHUNK. Cada chunk é devolvido junto com seu intervalo (inicio, fim)
+no texto original, de modo que texto[inicio:fim] == chunk.
+"""
+import config
+
+# Separadores em ordem de preferência: parágrafo, frase, linha e palavra.
+SEPARADORES_POR_NIVEL = [
+    ["\n\n"],
+    [". ", "! ", "? ", ".\n", "!\n", "?\n"],
+    ["\n"],
+    [" ", "\t"],
+]
+ESPACOS = " \t\r\n"
+
+def _encontrar_quebra(texto: str, inicio: int, limite: int, minimo: int) -> int:
+    """
+    Retorna a posição logo após o separador mais alto na hierarquia que termine
+    dentro de (minimo, limite]. Sem separador algum, corta exatamente em 'limite'.
+    """
+    for separadores in SEPARADORES_POR_NIVEL:
+        melhor = -1
+        for separador in separadores:
+            posicao = texto.rfind(separador, inicio, limite)
+            if posicao != -1:
+                # Frases terminam após a pontuação; o espaço seguinte fica de fora.
+                fim_separador = posicao + (1 if len(separador) == 2 and separador[0] in ".!?" else len(separador))
+                melhor = max(melhor, fim_separador)
+        if melhor > minimo:
+            return melhor
+    return limite
+
+def _pular_espacos(texto: str, posicao: int, fim: int) -> int:
+    while posicao < fim and texto[posicao] in ESPACOS:
+        posicao += 1
+    return posicao
+
+def _inicio_da_sobreposicao(texto: str, posicao: int, fim: int) -> int:
+    """Avança 'posicao' até o início da próxima palavra, para a sobreposição não começar no meio de uma."""
+    if posicao > 0 and texto[posicao - 1] not in ESPACOS:
+        while posicao < fim and texto[posicao] not in ESPACOS:
+            posicao += 1
+    return _pular_espacos(texto, posicao, fim)
+
+def dividir_texto(texto: str, tamanho_chunk: int = None, sobreposicao: int = None) -> list[tuple[str, int, int]]:
+    """
+    Divide o texto em chunks de até 'tamanho_chunk' caracteres, com cerca de
+    'sobreposicao' caracteres repetidos entre chunks vizinhos, em uma única
+    passada sobre o texto. Retorna uma lista de tuplas (texto_chunk, inicio, fim).
+    """
+    tamanho_chunk = tamanho_chunk or config.TAMANHO_CHUNK
+    sobreposicao = config.SOBREPOSICAO_CHUNK if sobreposicao is None else sobreposicao
+    if sobreposicao >= tamanho_chunk:
+        raise ValueError(f"A sobreposição ({sobreposicao}) deve ser menor que o tamanho do chunk ({tamanho_chunk}).")
+    if not texto:
+        return []
+
+    chunks = []
+    total = len(texto)
+    inicio = _pular_espacos(texto, 0, total)
+    while inicio < total:
+        limite = min(inicio + tamanho_chunk, total)
+        if limite == total:
+            fim = total
+        else:
+            # A quebra precisa passar da sobreposição para que o próximo chunk avance.
+            fim = _encontrar_quebra(texto, inicio, limite, inicio + sobreposicao)
+
+        fim_sem_espacos = fim
+        while fim_sem_espacos > inicio and texto[fim_sem_espacos - 1] in ESPACOS:
+            fim_sem_espacos -= 1
+        if fim_sem_espacos > inicio:
+            chunks.append((texto[inicio:fim_sem_espacos], inicio, fim_sem_espacos))
+
+        if fim == total:
+            break
+        proximo_inicio = _inicio_da_sobreposicao(texto, max(fim - sobreposicao, inicio + 1), fim)
+        if proximo_inicio >= fim_sem_espacos:
+            # Sobreposição só com espaços ou uma única palavra longa: segue sem repetir texto.
+            proximo_inicio = _pular_espacos(texto, fim, total)
+        inicio = proximo_inicio
+    return chunks
@@ -7,10 +7,14 @@ import config
 import os
 import requests
 import sqlite3
+import sys
 import tempfile
+import threading
 import whisper
+from .database_manager import descomprimir_texto, montar_consulta_fts
+from .divisor_texto import dividir_texto
+from collections import OrderedDict
 from dotenv import load_dotenv
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 
@@ -25,6 +29,11 @@ model_whisper = None
 chroma_client = None
 chroma_collection = None
 
+# Cache LRU dos textos descomprimidos, limitado em bytes (config.LIMITE_CACHE_TEXTOS_BYTES)
+cache_textos = OrderedDict()
+cache_textos_bytes = 0
+cache_textos_lock = threading.Lock()
+
 
 # --- FUNÇÕES DE INICIALIZAÇÃO E CARREGAMENTO DE MODELOS ---
 def carregar_modelo_embedding():
@@ -101,19 +110,15 @@ def conectar_db():
 
 def obter_documentos_para_embedding():
     conn = conectar_db()
-    cursor = conn.execute("SELECT id, nome_arquivo, texto_completo FROM documentos WHERE texto_completo IS NOT NULL AND texto_completo != '' AND indexado_no_chroma = 0")
+    cursor = conn.execute("SELECT id, nome_arquivo, texto_completo FROM documentos WHERE texto_completo IS NOT NULL AND length(texto_completo) > 0 AND indexado_no_chroma = 0")
     documentos = cursor.fetchall()
     conn.close()
     return documentos
 
-def dividir_texto_em_chunks(texto: str) -> list[str]:
+def dividir_texto_em_chunks(texto: str) -> list[tuple[str, int, int]]:
+    """Divide o texto em chunks (texto_chunk, inicio, fim) conforme TAMANHO_CHUNK e SOBREPOSICAO_CHUNK."""
     if not texto: return []
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=config.TAMANHO_CHUNK,
-        chunk_overlap=config.SOBREPOSICAO_CHUNK,
-        length_function=len
-    )
-    return text_splitter.split_text(texto)
+    return dividir_texto(texto, config.TAMANHO_CHUNK, config.SOBREPOSICAO_CHUNK)
 
 def gerar_embeddings_para_chunks(chunks_de_texto: list[str]) -> list[list[float]]:
     modelo_carregado = carregar_modelo_embedding()
@@ -121,19 +126,94 @@ def gerar_embeddings_para_chunks(chunks_de_texto: list[str]) -> list[list[float]
     embeddings = modelo_carregado.encode(chunks_de_texto, convert_to_tensor=False)
     return embeddings.tolist()
 
-def adicionar_chunks_ao_chroma(doc_id: int, nome_arquivo: str, chunks_texto: list[str], embeddings_vetores: list[list[float]]):
+def adicionar_chunks_ao_chroma(doc_id: int, nome_arquivo: str, ids_chunks_sqlite: list[int], embeddings_vetores: list[list[float]]) -> bool:
+    """
+    Salva no ChromaDB apenas os embeddings e metadados dos chunks. O texto fica
+    somente no SQLite, referenciado pelo id do chunk ('id_chunk_sqlite').
+    """
     collection = inicializar_chroma()
-    if not all([collection, chunks_texto, embeddings_vetores]) or len(chunks_texto) != len(embeddings_vetores): return
+    if not all([collection, ids_chunks_sqlite, embeddings_vetores]) or len(ids_chunks_sqlite) != len(embeddings_vetores): return False
 
-    ids_chunks = [f"doc{doc_id}_chunk{i}" for i in range(len(chunks_texto))]
-    metadatas_chunks = [{"doc_id_original": doc_id, "nome_arquivo_original": nome_arquivo, "indice_chunk": i} for i in range(len(chunks_texto))]
-    chunks_em_minusculas = [chunk.lower() for chunk in chunks_texto]
+    ids_chunks = [f"doc{doc_id}_chunk{i}" for i in range(len(ids_chunks_sqlite))]
+    metadatas_chunks = [
+        {"doc_id_original": doc_id, "nome_arquivo_original": nome_arquivo, "indice_chunk": i, "id_chunk_sqlite": id_sqlite}
+        for i, id_sqlite in enumerate(ids_chunks_sqlite)
+    ]
     try:
-        collection.upsert(ids=ids_chunks, embeddings=embeddings_vetores, metadatas=metadatas_chunks, documents=chunks_em_minusculas)
+        # Remove chunks antigos do documento (incluindo cópias de texto de versões anteriores).
+        collection.delete(where={"doc_id_original": doc_id})
+        collection.add(ids=ids_chunks, embeddings=embeddings_vetores, metadatas=metadatas_chunks)
         print(f"  - {len(ids_chunks)} chunks do doc ID {doc_id} ('{nome_arquivo}') adicionados/atualizados no ChromaDB.")
         # A responsabilidade de marcar como indexado foi movida para o script orquestrador.
+        return True
     except Exception as e:
         print(f"Erro ao adicionar/atualizar chunks no ChromaDB para doc ID {doc_id}: {e}")
+        return False
+
+def obter_texto_documento(doc_id: int) -> str:
+    """
+    Lê e descomprime o texto completo de um documento. Os mais recentes ficam em
+    cache até somarem LIMITE_CACHE_TEXTOS_BYTES; textos maiores que o limite não são guardados.
+    """
+    global cache_textos_bytes
+    with cache_textos_lock:
+        if doc_id in cache_textos:
+            cache_textos.move_to_end(doc_id)
+            return cache_textos[doc_id]
+
+    conn = conectar_db()
+    try:
+        linha = conn.execute("SELECT texto_completo FROM documentos WHERE id = ?", (doc_id,)).fetchone()
+    finally:
+        conn.close()
+    texto = descomprimir_texto(linha[0]) if linha else ""
+
+    tamanho = sys.getsizeof(texto)
+    if tamanho <= config.LIMITE_CACHE_TEXTOS_BYTES:
+        with cache_textos_lock:
+            if doc_id not in cache_textos:
+                cache_textos[doc_id] = texto
+                cache_textos_bytes += tamanho
+            while cache_textos_bytes > config.LIMITE_CACHE_TEXTOS_BYTES:
+                _, texto_removido = cache_textos.popitem(last=False)
+                cache_textos_bytes -= sys.getsizeof(texto_removido)
+    return texto
+
+def buscar_ids_chunks_por_palavras(palavras_chave: list[str], limite: int) -> list[int]:
+    """
+    Consulta o índice FTS5 e retorna os ids dos até 'limite' chunks mais relevantes (BM25)
+    que contêm alguma das palavras (ou prefixos).
+    """
+    consulta = montar_consulta_fts(palavras_chave)
+    if not consulta: return []
+    conn = conectar_db()
+    try:
+        cursor = conn.execute(
+            "SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH ? ORDER BY bm25(chunks_fts) LIMIT ?",
+            (consulta, limite)
+        )
+        return [linha[0] for linha in cursor.fetchall()]
+    finally:
+        conn.close()
+
+def obter_textos_dos_chunks(ids_chunks_sqlite: list[int]) -> dict[int, str]:
+    """Reconstrói o texto dos chunks a partir dos intervalos sobre o texto canônico."""
+    if not ids_chunks_sqlite: return {}
+    conn = conectar_db()
+    try:
+        marcadores = ",".join("?" * len(ids_chunks_sqlite))
+        cursor = conn.execute(f"SELECT id, doc_id, inicio, fim FROM chunks WHERE id IN ({marcadores})", ids_chunks_sqlite)
+        intervalos = cursor.fetchall()
+    finally:
+        conn.close()
+    textos = {}
+    # Cada documento é descomprimido uma única vez por consulta, mesmo fora do cache.
+    for doc_id in {doc_id for _, doc_id, _, _ in intervalos}:
+        texto_documento = obter_texto_documento(doc_id)
+        for chunk_id, doc_id_chunk, inicio, fim in intervalos:
+            if doc_id_chunk == doc_id:
+                textos[chunk_id] = texto_documento[inicio:fim]
+    return textos
 
 def buscar_chunks_relevantes(texto_pergunta: str, top_n: int) -> list[dict]:
     collection = inicializar_chroma()
@@ -144,16 +224,20 @@ def buscar_chunks_relevantes(texto_pergunta: str, top_n: int) -> list[dict]:
     palavras_da_pergunta = pergunta_lower.split()
     palavras_chave_dinamicas = [palavra.strip("?,.:;!") for palavra in palavras_da_pergunta if palavra.strip("?,.:;!") not in config.STOPWORDS]
     
-    where_document_filter = None
+    where_filter = None
     if palavras_chave_dinamicas:
-        if len(palavras_chave_dinamicas) > 1:
-            clausulas_filtro = [{"$contains": palavra} for palavra in palavras_chave_dinamicas]
-            where_document_filter = {"$or": clausulas_filtro}
-        elif len(palavras_chave_dinamicas) == 1:
-            where_document_filter = {"$contains": palavras_chave_dinamicas[0]}
-
-        if where_document_filter:
-            print(f"  - Aplicando filtro de DOCUMENTO no ChromaDB: {where_document_filter}")
+        try:
+            # Limitado para não repassar ao ChromaDB uma lista de ids do tamanho do acervo.
+            ids_candidatos = buscar_ids_chunks_por_palavras(palavras_chave_dinamicas, config.LIMITE_CANDIDATOS_PALAVRAS_CHAVE)
+        except Exception as e:
+            # Ex.: banco ainda não migrado por 'atualizar_oraculo.py' (sem 'chunks_fts').
+            print(f"Erro ao consultar o índice de palavras-chave: {e}. Fazendo busca semântica geral.")
+            ids_candidatos = None
+        if ids_candidatos is not None:
+            print(f"  - Índice de palavras-chave {palavras_chave_dinamicas}: {len(ids_candidatos)} chunk(s) candidato(s).")
+            if not ids_candidatos:
+                return []
+            where_filter = {"id_chunk_sqlite": {"$in": ids_candidatos}}
     else:
         print("  - Nenhuma palavra-chave específica identificada, fazendo busca semântica geral.")
 
@@ -161,14 +245,16 @@ def buscar_chunks_relevantes(texto_pergunta: str, top_n: int) -> list[dict]:
     
     try:
         resultados = collection.query(
-            query_embeddings=[embedding_pergunta], n_results=top_n, where_document=where_document_filter, include=['documents', 'metadatas', 'distances']
+            query_embeddings=[embedding_pergunta], n_results=top_n, where=where_filter, include=['metadatas', 'distances']
         )
         chunks_encontrados = []
         if resultados and resultados.get('ids')[0]:
+            metadatas = resultados['metadatas'][0]
+            textos = obter_textos_dos_chunks([metadado.get("id_chunk_sqlite") for metadado in metadatas])
             for i in range(len(resultados['ids'][0])):
                 chunks_encontrados.append({
-                    "id_chunk_db": resultados['ids'][0][i], "texto_chunk": resultados['documents'][0][i],
-                    "metadatos": resultados['metadatas'][0][i], "distancia": resultados['distances'][0][i]
+                    "id_chunk_db": resultados['ids'][0][i], "texto_chunk": textos.get(metadatas[i].get("id_chunk_sqlite"), ""),
+                    "metadatos": metadatas[i], "distancia": resultados['distances'][0][i]
                 })
         return chunks_encontrados
     except Exception as e:
@@ -0,0 +1,464 @@
+# teste_carga_webhook.py
+"""
+Teste de carga do webhook do WhatsApp ('app.py') sem tocar na Twilio nem no Ollama reais.
+
+Sobe o servidor Flask do Oráculo em um processo próprio e, no processo principal,
+dois servidores HTTP locais e o gerador de carga:
+  - Twilio simulada: recebe o 'messages.create' da API REST e serve o áudio de 'MediaUrl0';
+  - Ollama simulado: responde ao '/api/generate' com latência e concorrência configuráveis.
+
+Em seguida envia formulários no formato dos webhooks da Twilio (texto e áudio) a uma taxa
+fixa e mede vazão, atraso de fila no LLM, latência ponta a ponta das respostas e, ao longo
+do tempo, threads e memória residente apenas do processo do app (lidas de /proc, no Linux).
+A busca no ChromaDB e o modelo de embedding continuam sendo os reais, pois rodam localmente.
+
+Exemplo:
+    python teste_carga_webhook.py --taxa 5 --duracao 60 --remetentes 6 --latencia-ollama 2.5
+"""
+import argparse
+import config
+import io
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import re
+import requests
+import threading
+import time
+import wave
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from werkzeug.serving import make_server
+
+# --- Credenciais falsas: precisam existir antes de importar o 'app' ---
+os.environ["TWILIO_ACCOUNT_SID"] = "AC" + "0" * 32
+os.environ["TWILIO_AUTH_TOKEN"] = "token_teste_de_carga"
+os.environ["TWILIO_PHONE_NUMBER"] = "+15550000000"
+
+PERGUNTAS_TEXTO = [
+    "Qual a data de nascimento do vovô?",
+    "Onde foi o casamento dos meus pais?",
+    "Quem é o proprietário da casa da praia?",
+    "Qual o número da matrícula do imóvel?",
+    "Quando vence o seguro do carro?",
+    "Qual o nome completo da bisavó materna?",
+    "Em que cartório foi registrada a escritura?",
+    "Qual o valor do último IPTU pago?",
+    "Quais documentos mencionam a fazenda?",
+    "Qual a profissão do tio Antônio na certidão?",
+]
+MENSAGENS_CURTAS = ["Bom dia", "Oi Jarvis", "obrigado", "tchau"]
+# 'gerar_resposta_com_llm' devolve "Erro ao contatar o LLM: ..." / "Erro: Prompt vazio." em caso de falha.
+PREFIXO_ERRO_LLM = "Erro"
+
+
+class RegistroDeMetricas:
+    """Acumula, de forma thread-safe, os tempos medidos durante o teste."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.inicio = time.monotonic()
+        self.envios = []               # (t_envio, atraso_envio, latencia_webhook, tipo)
+        self.respostas_finais = []     # (t_recebida, latencia_ponta_a_ponta)
+        self.respostas_erro_llm = []   # (t_recebida, tempo_ate_o_erro)
+        self.atrasos_fila_ollama = []  # segundos aguardando uma vaga no LLM simulado
+        self.pendentes = defaultdict(list)  # remetente -> [(pergunta, t_envio)]
+        self.amostras = []             # (t, threads_app, rss_app_mb, pendentes)
+        self.erros_webhook = 0
+        self.respostas_sem_pendente = 0
+
+    def agora(self) -> float:
+        return time.monotonic() - self.inicio
+
+    def total_pendentes(self) -> int:
+        with self.lock:
+            return sum(len(lista) for lista in self.pendentes.values())
+
+    def registrar_pendente(self, remetente: str, pergunta, t_envio: float):
+        with self.lock:
+            self.pendentes[remetente].append((pergunta, t_envio))
+
+    def descartar_pendente(self, remetente: str, t_envio: float):
+        with self.lock:
+            self.pendentes[remetente] = [p for p in self.pendentes[remetente] if p[1] != t_envio]
+
+    def registrar_resposta_final(self, remetente: str, corpo: str):
+        """
+        Casa a resposta recebida pela Twilio simulada com a mensagem pendente do remetente:
+        pela pergunta ecoada pelo Ollama simulado ou, para áudios, pela mais antiga sem
+        pergunta conhecida. Erros do LLM não ecoam a pergunta; consomem a pendência mais
+        antiga e são contados à parte, fora das latências.
+        """
+        t_recebida = self.agora()
+        with self.lock:
+            fila = self.pendentes.get(remetente, [])
+            if corpo.startswith(PREFIXO_ERRO_LLM):
+                if fila:
+                    _, t_envio = fila.pop(0)
+                    self.respostas_erro_llm.append((t_recebida, t_recebida - t_envio))
+                else:
+                    self.respostas_erro_llm.append((t_recebida, float("nan")))
+                return
+            indice = next((i for i, (pergunta, _) in enumerate(fila) if pergunta and pergunta in corpo), None)
+            if indice is None:
+                indice = next((i for i, (pergunta, _) in enumerate(fila) if pergunta is None), None)
+            if indice is None:
+                self.respostas_sem_pendente += 1
+                return
+            _, t_envio = fila.pop(indice)
+            self.respostas_finais.append((t_recebida, t_recebida - t_envio))
+
+
+# --- Servidores simulados ---
+def gerar_audio_wav(segundos: float = 2.0, taxa_amostragem: int = 16000) -> bytes:
+    """Gera um WAV mono com um tom simples, usado quando nenhum arquivo de áudio é informado."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as arquivo_wav:
+        arquivo_wav.setnchannels(1)
+        arquivo_wav.setsampwidth(2)
+        arquivo_wav.setframerate(taxa_amostragem)
+        quadros = bytearray()
+        for i in range(int(segundos * taxa_amostragem)):
+            amostra = int(8000 * math.sin(2 * math.pi * 440 * i / taxa_amostragem))
+            quadros += amostra.to_bytes(2, "little", signed=True)
+        arquivo_wav.writeframes(bytes(quadros))
+    return buffer.getvalue()
+
+def sortear_latencia(media: float, variacao: float) -> float:
+    return max(0.0, random.uniform(media - variacao, media + variacao))
+
+def criar_servidor_twilio(metricas: RegistroDeMetricas, audio: bytes, latencia: float, variacao: float) -> ThreadingHTTPServer:
+    """Servidor que imita a API REST de mensagens e o download de mídia da Twilio."""
+
+    class TwilioSimulada(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            # Download de mídia ('MediaUrl0')
+            time.sleep(sortear_latencia(latencia, variacao))
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/ogg")
+            self.send_header("Content-Length", str(len(audio)))
+            self.end_headers()
+            self.wfile.write(audio)
+
+        def do_POST(self):
+            # 'twilio_client.messages.create' -> POST .../Messages.json
+            tamanho = int(self.headers.get("Content-Length", 0))
+            campos = parse_qs(self.rfile.read(tamanho).decode("utf-8"))
+            time.sleep(sortear_latencia(latencia, variacao))
+            metricas.registrar_resposta_final(campos.get("To", [""])[0], campos.get("Body", [""])[0])
+            corpo = json.dumps({"sid": "SM" + os.urandom(16).hex(), "status": "queued"}).encode("utf-8")
+            self.send_response(201)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+    return ThreadingHTTPServer(("127.0.0.1", 0), TwilioSimulada)
+
+def criar_servidor_ollama(metricas: RegistroDeMetricas, latencia: float, variacao: float, concorrencia: int) -> ThreadingHTTPServer:
+    """
+    Servidor que imita o '/api/generate' do Ollama. Atende no máximo 'concorrencia'
+    gerações ao mesmo tempo, como o Ollama real; o tempo de espera por uma vaga é o
+    atraso de fila reportado.
+    """
+    vagas = threading.Semaphore(concorrencia)
+
+    class OllamaSimulado(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            tamanho = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(tamanho) or b"{}")
+            encontrada = re.search(r"NOVA PERGUNTA: (.*?)\n\nRESPOSTA:", payload.get("prompt", ""), re.DOTALL)
+            pergunta = encontrada.group(1) if encontrada else ""
+
+            t_chegada = time.monotonic()
+            with vagas:
+                with metricas.lock:
+                    metricas.atrasos_fila_ollama.append(time.monotonic() - t_chegada)
+                time.sleep(sortear_latencia(latencia, variacao))
+
+            corpo = json.dumps({
+                "model": payload.get("model"), "done": True,
+                "response": f"Resposta simulada para: {pergunta}",
+            }).encode("utf-8")
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+            except (BrokenPipeError, ConnectionResetError):
+                # O app desistiu da chamada (timeout); o erro já é contado na resposta enviada à Twilio.
+                pass
+
+    return ThreadingHTTPServer(("127.0.0.1", 0), OllamaSimulado)
+
+def iniciar_em_thread(servidor) -> threading.Thread:
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+# --- Aplicação sob teste ---
+def preparar_app(url_twilio: str, url_ollama: str, latencia_stt_simulada):
+    """Importa o 'app' apontando o cliente da Twilio e a URL do Ollama para os servidores locais."""
+    from twilio.http.http_client import TwilioHttpClient
+    from twilio.rest import Client
+
+    class ClienteHttpRedirecionado(TwilioHttpClient):
+        """Reescreve 'https://api.twilio.com/...' para o servidor simulado."""
+        def request(self, method, url, *args, **kwargs):
+            partes = urlsplit(url)
+            return super().request(method, f"{url_twilio}{partes.path}", *args, **kwargs)
+
+    config.OLLAMA_API_URL = f"{url_ollama}/api/generate"
+    import app as modulo_app
+
+    modulo_app.twilio_client = Client(
+        os.environ["TWILIO_ACCOUNT_SID"], os.environ["TWILIO_AUTH_TOKEN"],
+        http_client=ClienteHttpRedirecionado()
+    )
+
+    if latencia_stt_simulada is not None:
+        def transcrever_simulado(url_audio: str) -> str:
+            requests.get(url_audio, timeout=30).raise_for_status()
+            time.sleep(latencia_stt_simulada)
+            return random.choice(PERGUNTAS_TEXTO)
+        modulo_app.transcrever_audio_de_url = transcrever_simulado
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    return modulo_app.app
+
+def executar_app(url_twilio: str, url_ollama: str, latencia_stt_simulada, fila_porta):
+    """Ponto de entrada do processo do app: informa a porta escolhida e atende o webhook."""
+    servidor_app = make_server("127.0.0.1", 0, preparar_app(url_twilio, url_ollama, latencia_stt_simulada), threaded=True)
+    fila_porta.put(servidor_app.server_port)
+    servidor_app.serve_forever()
+
+
+# --- Geração de carga e amostragem ---
+def ler_status_processo(pid: int) -> tuple:
+    """Retorna (threads, RSS em MB) do processo; (None, None) onde não há /proc."""
+    threads = rss_mb = None
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for linha in status:
+                if linha.startswith("Threads:"):
+                    threads = int(linha.split()[1])
+                elif linha.startswith("VmRSS:"):
+                    rss_mb = int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    return threads, rss_mb
+
+def amostrar_processo(metricas: RegistroDeMetricas, pid_app: int, intervalo: float, parar: threading.Event):
+    while not parar.is_set():
+        threads, rss_mb = ler_status_processo(pid_app)
+        metricas.amostras.append((metricas.agora(), threads, rss_mb, metricas.total_pendentes()))
+        parar.wait(intervalo)
+
+def montar_formulario(remetente: str, indice: int, url_twilio: str, proporcao_audio: float, proporcao_curtas: float) -> tuple[dict, str, object]:
+    """Monta um POST como o enviado pela Twilio. Retorna (campos, tipo, pergunta esperada)."""
+    campos = {
+        "SmsMessageSid": f"SM{indice:032d}", "MessageSid": f"SM{indice:032d}",
+        "AccountSid": os.environ["TWILIO_ACCOUNT_SID"], "From": remetente,
+        "To": f"whatsapp:{os.environ['TWILIO_PHONE_NUMBER']}",
+        "ProfileName": f"Familiar {remetente[-2:]}", "WaId": remetente.split("+")[-1],
+        "NumSegments": "1", "ApiVersion": "2010-04-01",
+    }
+    sorteio = random.random()
+    if sorteio < proporcao_audio:
+        campos.update({"NumMedia": "1", "Body": "", "MediaContentType0": "audio/ogg",
+                       "MediaUrl0": f"{url_twilio}/2010-04-01/Accounts/{campos['AccountSid']}/Messages/{campos['MessageSid']}/Media/ME{indice:032d}"})
+        return campos, "audio", None
+    if sorteio < proporcao_audio + proporcao_curtas:
+        campos.update({"NumMedia": "0", "Body": random.choice(MENSAGENS_CURTAS)})
+        return campos, "curta", None
+    pergunta = random.choice(PERGUNTAS_TEXTO)
+    campos.update({"NumMedia": "0", "Body": pergunta})
+    return campos, "texto", pergunta
+
+def enviar_mensagem(metricas: RegistroDeMetricas, url_webhook: str, campos: dict, tipo: str, pergunta, t_agendado: float):
+    t_envio = metricas.agora()
+    remetente = campos["From"]
+    # Registrada antes do envio: a resposta final pode chegar antes do retorno do webhook.
+    metricas.registrar_pendente(remetente, pergunta, t_envio)
+    try:
+        resposta = requests.post(url_webhook, data=campos, timeout=300)
+        latencia_webhook = metricas.agora() - t_envio
+        if "Processando" not in resposta.text:
+            # Saudação, despedida ou transcrição vazia: nenhuma resposta assíncrona virá.
+            metricas.descartar_pendente(remetente, t_envio)
+        if resposta.status_code != 200:
+            with metricas.lock:
+                metricas.erros_webhook += 1
+    except requests.RequestException:
+        latencia_webhook = metricas.agora() - t_envio
+        metricas.descartar_pendente(remetente, t_envio)
+        with metricas.lock:
+            metricas.erros_webhook += 1
+    with metricas.lock:
+        metricas.envios.append((t_envio, t_envio - t_agendado, latencia_webhook, tipo))
+
+def gerar_carga(args, metricas: RegistroDeMetricas, url_webhook: str, url_twilio: str):
+    """Dispara mensagens em malha aberta na taxa pedida (intervalos fixos ou de Poisson)."""
+    remetentes = [f"whatsapp:+55119990000{i:02d}" for i in range(args.remetentes)]
+    total = int(args.taxa * args.duracao)
+    with ThreadPoolExecutor(max_workers=args.max_conexoes) as executor:
+        t_agendado = metricas.agora()
+        for indice in range(total):
+            espera = t_agendado - metricas.agora()
+            if espera > 0:
+                time.sleep(espera)
+            campos, tipo, pergunta = montar_formulario(random.choice(remetentes), indice, url_twilio,
+                                                       args.proporcao_audio, args.proporcao_curtas)
+            executor.submit(enviar_mensagem, metricas, url_webhook, campos, tipo, pergunta, t_agendado)
+            intervalo = random.expovariate(args.taxa) if args.poisson else 1 / args.taxa
+            t_agendado += intervalo
+
+
+# --- Relatório ---
+def percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return float("nan")
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, max(0, math.ceil(p / 100 * len(ordenados)) - 1))]
+
+def linha_percentis(rotulo: str, valores: list[float]) -> str:
+    return (f"{rotulo:<32} n={len(valores):<6} p50={percentil(valores, 50):7.3f}s "
+            f"p90={percentil(valores, 90):7.3f}s p99={percentil(valores, 99):7.3f}s "
+            f"máx={max(valores) if valores else float('nan'):7.3f}s")
+
+def imprimir_relatorio(args, metricas: RegistroDeMetricas, t_fim_envio: float):
+    envios = metricas.envios
+    finais = metricas.respostas_finais
+    t_total = metricas.agora()
+    print("\n" + "=" * 30 + " RESULTADO DO TESTE DE CARGA " + "=" * 30)
+    print(f"Taxa alvo: {args.taxa:.2f} msg/s | Duração: {args.duracao:.0f}s | Remetentes: {args.remetentes}")
+    print(f"Mensagens enviadas: {len(envios)} "
+          f"(texto={sum(e[3] == 'texto' for e in envios)}, áudio={sum(e[3] == 'audio' for e in envios)}, "
+          f"curtas={sum(e[3] == 'curta' for e in envios)}) | erros no webhook: {metricas.erros_webhook}")
+    print(f"Vazão de envio: {len(envios) / t_fim_envio if t_fim_envio else 0:.2f} msg/s | "
+          f"Vazão de respostas finais: {len(finais) / t_total if t_total else 0:.2f} msg/s")
+    print(f"Respostas finais recebidas: {len(finais)} | Respostas de erro do LLM: {len(metricas.respostas_erro_llm)} | "
+          f"Sem resposta ao final: {metricas.total_pendentes()} | "
+          f"Respostas sem mensagem correspondente: {metricas.respostas_sem_pendente}")
+    print(linha_percentis("Atraso do gerador de carga", [e[1] for e in envios]))
+    print(linha_percentis("Latência do webhook", [e[2] for e in envios]))
+    print(linha_percentis("Atraso de fila no Ollama", metricas.atrasos_fila_ollama))
+    print(linha_percentis("Latência ponta a ponta", [f[1] for f in finais]))
+    if metricas.respostas_erro_llm:
+        print(linha_percentis("Tempo até erro do LLM", [e[1] for e in metricas.respostas_erro_llm if not math.isnan(e[1])]))
+
+    amostras_validas = [a for a in metricas.amostras if a[1] is not None]
+    if amostras_validas:
+        print(f"\nProcesso do app (sem o gerador de carga e os simuladores):")
+        print(f"{'t (s)':>8} {'threads':>8} {'RSS (MB)':>10} {'pendentes':>10}")
+        passo = max(1, len(amostras_validas) // 40)
+        for t, threads, rss, pendentes in amostras_validas[::passo]:
+            print(f"{t:8.1f} {threads:8d} {rss:10.1f} {pendentes:10d}")
+        print(f"Pico de threads do app: {max(a[1] for a in amostras_validas)} | "
+              f"Pico de RSS do app: {max(a[2] for a in amostras_validas):.1f} MB")
+    elif metricas.amostras:
+        print("\nThreads e memória do app indisponíveis: /proc não encontrado neste sistema.")
+
+    if args.saida_json:
+        with open(args.saida_json, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "parametros": vars(args), "envios": envios, "respostas_finais": finais,
+                "respostas_erro_llm": metricas.respostas_erro_llm,
+                "atrasos_fila_ollama": metricas.atrasos_fila_ollama, "amostras": metricas.amostras,
+                "erros_webhook": metricas.erros_webhook, "sem_resposta": metricas.total_pendentes(),
+            }, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nDados brutos salvos em '{args.saida_json}'.")
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Teste de carga do webhook do WhatsApp com Twilio e Ollama simulados.")
+    parser.add_argument("--taxa", type=float, default=2.0, help="Mensagens por segundo.")
+    parser.add_argument("--duracao", type=float, default=30.0, help="Segundos gerando carga.")
+    parser.add_argument("--remetentes", type=int, default=5, help="Número de familiares distintos.")
+    parser.add_argument("--poisson", action="store_true", help="Usa chegadas de Poisson em vez de intervalos fixos.")
+    parser.add_argument("--proporcao-audio", type=float, default=0.2, help="Fração de mensagens com 'MediaUrl0'.")
+    parser.add_argument("--proporcao-curtas", type=float, default=0.1, help="Fração de saudações/despedidas.")
+    parser.add_argument("--latencia-ollama", type=float, default=3.0, help="Latência média de geração do LLM (s).")
+    parser.add_argument("--variacao-ollama", type=float, default=1.0, help="Variação (+/-) da latência do LLM (s).")
+    parser.add_argument("--concorrencia-ollama", type=int, default=1, help="Gerações simultâneas no LLM simulado.")
+    parser.add_argument("--latencia-twilio", type=float, default=0.15, help="Latência média da API da Twilio (s).")
+    parser.add_argument("--variacao-twilio", type=float, default=0.05, help="Variação (+/-) da latência da Twilio (s).")
+    parser.add_argument("--arquivo-audio", help="Áudio servido em 'MediaUrl0' (padrão: tom gerado em WAV).")
+    parser.add_argument("--stt-simulado", type=float, metavar="SEGUNDOS",
+                        help="Substitui a transcrição do Whisper por uma pausa desta duração.")
+    parser.add_argument("--tempo-drenagem", type=float, default=120.0, help="Espera máxima por respostas após a carga (s).")
+    parser.add_argument("--tempo-inicializacao", type=float, default=600.0, help="Espera máxima pela subida do app (s).")
+    parser.add_argument("--intervalo-amostragem", type=float, default=1.0, help="Intervalo entre amostras de threads/memória (s).")
+    parser.add_argument("--max-conexoes", type=int, default=64, help="Conexões simultâneas do gerador de carga.")
+    parser.add_argument("--semente", type=int, help="Semente para reproduzir a mesma sequência de mensagens.")
+    parser.add_argument("--saida-json", help="Arquivo para salvar as medições brutas.")
+    return parser.parse_args()
+
+def main():
+    args = ler_argumentos()
+    if args.semente is not None:
+        random.seed(args.semente)
+
+    if args.arquivo_audio:
+        with open(args.arquivo_audio, "rb") as arquivo:
+            audio = arquivo.read()
+    else:
+        audio = gerar_audio_wav()
+
+    metricas = RegistroDeMetricas()
+    servidor_twilio = criar_servidor_twilio(metricas, audio, args.latencia_twilio, args.variacao_twilio)
+    servidor_ollama = criar_servidor_ollama(metricas, args.latencia_ollama, args.variacao_ollama, args.concorrencia_ollama)
+    iniciar_em_thread(servidor_twilio)
+    iniciar_em_thread(servidor_ollama)
+    url_twilio = f"http://127.0.0.1:{servidor_twilio.server_port}"
+    url_ollama = f"http://127.0.0.1:{servidor_ollama.server_port}"
+    print(f"Twilio simulada em {url_twilio} | Ollama simulado em {url_ollama}")
+
+    # 'spawn' evita herdar as threads e sockets dos simuladores já em execução.
+    contexto = multiprocessing.get_context("spawn")
+    fila_porta = contexto.Queue()
+    processo_app = contexto.Process(target=executar_app, args=(url_twilio, url_ollama, args.stt_simulado, fila_porta), daemon=True)
+    processo_app.start()
+    print("Iniciando o app em processo separado (carrega os modelos de IA)...")
+    porta_app = fila_porta.get(timeout=args.tempo_inicializacao)
+    url_webhook = f"http://127.0.0.1:{porta_app}/whatsapp"
+    print(f"Webhook sob teste em {url_webhook} (PID {processo_app.pid})")
+
+    parar_amostragem = threading.Event()
+    metricas.inicio = time.monotonic()
+    amostrador = threading.Thread(target=amostrar_processo, args=(metricas, processo_app.pid, args.intervalo_amostragem, parar_amostragem), daemon=True)
+    amostrador.start()
+
+    print(f"\nGerando carga: {args.taxa} msg/s por {args.duracao}s...")
+    gerar_carga(args, metricas, url_webhook, url_twilio)
+    t_fim_envio = metricas.agora()
+
+    print(f"Carga encerrada. Aguardando até {args.tempo_drenagem}s pelas respostas pendentes...")
+    limite = time.monotonic() + args.tempo_drenagem
+    while metricas.total_pendentes() and time.monotonic() < limite:
+        time.sleep(0.5)
+
+    parar_amostragem.set()
+    amostrador.join()
+    imprimir_relatorio(args, metricas, t_fim_envio)
+
+    processo_app.terminate()
+    processo_app.join()
+    servidor_twilio.shutdown()
+    servidor_ollama.shutdown()
+
+
+if __name__ == "__main__":
+    main()